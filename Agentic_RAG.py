@@ -1,20 +1,30 @@
 import os
+import asyncio
+import hashlib
+import shutil
+import functools
+import threading
+from pathlib import Path
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
 import re
-from langchain_community.document_loaders import UnstructuredPDFLoader, DirectoryLoader
+from concurrent.futures import ProcessPoolExecutor
+from langchain_community.document_loaders import UnstructuredPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferMemory
-from langchain_groq import ChatGroq
 from langchain.agents import Tool
+from langchain_core.callbacks import AsyncCallbackHandler
 from dateutil import parser, relativedelta
 from dateutil.relativedelta import relativedelta, MO, TU, WE, TH, FR, SA, SU
 import phonenumbers
 import pytz
+import orjson
+import xxhash
+from embeddings import get_embeddings
+from llm_client import get_llm
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,43 +32,309 @@ load_dotenv()
 # Use environment variable for API key
 os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
 
+# "model2vec" (default) uses a static distillation of MPNet; "mpnet" runs the full transformer
+# through quantized ONNX Runtime and "mpnet-torch" through torch.compile
+EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "model2vec")
+
+_QUERY_ERROR_MESSAGE = "I encountered an error processing your query. Please try again. Error: {}"
+
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
+# Cheap length check run before the phonenumbers metadata lookup. The shortest valid
+# number in phonenumbers' metadata is 6 digits including the country code, and letters
+# count because phonenumbers maps keypad letters ("1-800-FLOWERS") to digits.
+_PHONE_MIN_ALNUM = 6
+
+def _keyword_re(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into a single alternation so each query is scanned once per set"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+# Enhanced scheduling keywords
+_SCHEDULING_RE = _keyword_re([
+    'schedule', 'book', 'appointment', 'call', 'meet',
+    'want to talk', 'discuss', 'consultation', 'meeting',
+    'set up', 'arrange', 'plan', 'catch up', 'sync',
+    'connect', 'get in touch', 'reach out'
+])
+
+# Time-related keywords
+_TIME_RE = _keyword_re([
+    'morning', 'afternoon', 'evening', 'night',
+    'today', 'tomorrow', 'next', 'weekend',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+    'saturday', 'sunday', 'week', 'month',
+    'am', 'pm', 'o\'clock', ':00'
+])
+
+# Help keywords
+_HELP_RE = _keyword_re([
+    'help', 'how to', 'guide', 'explain',
+    'what can you do', 'capabilities', 'features'
+])
+
+# Memory-related phrases
+_MEMORY_RE = _keyword_re([
+    'what did i just', 'last question', 'previous',
+    'what were we talking about', 'what was i saying'
+])
+
+DOCUMENTS_DIR = "./documents"
+CHROMA_DIR = "./.chroma"
+INDEX_COMPLETE_MARKER = ".complete"
+# Bump when chunking or deduplication changes what gets indexed, so old indexes are rebuilt
+INDEX_VERSION = "v2"
+SCHEDULED_CALLS_PATH = "./calls.jsonl"
+
+# Sentence embeddings are compared by angle, so index them with cosine distance
+COLLECTION_METADATA = {"hnsw:space": "cosine"}
+RETRIEVER_K = 4
+
+_TZ = pytz.timezone('Asia/Kathmandu')
+
+# Relative date phrases, checked in order before weekdays
+_RELATIVE_DATES = {
+    "today": relativedelta(),
+    "tomorrow": relativedelta(days=1),
+    "next week": relativedelta(weeks=1)
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+_WEEKDAYS = {
+    'monday': MO, 'tuesday': TU, 'wednesday': WE,
+    'thursday': TH, 'friday': FR, 'saturday': SA, 'sunday': SU
+}
+
+def documents_fingerprint(directory: str = DOCUMENTS_DIR) -> str:
+    """Hash the path, mtime and size of every PDF so any change triggers a re-ingest"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(directory).rglob("*.pdf")):
+        stat = path.stat()
+        digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+def prune_stale_indexes(persist_directory: str):
+    """Remove indexes built for earlier versions of the documents next to the current one"""
+    current = Path(persist_directory)
+    for sibling in current.parent.iterdir():
+        if sibling.is_dir() and sibling.name != current.name:
+            shutil.rmtree(sibling, ignore_errors=True)
+
+def load_scheduled_calls(path: str = SCHEDULED_CALLS_PATH) -> List[Dict]:
+    """Read previously scheduled calls, one JSON object per line"""
+    if not os.path.exists(path):
+        return []
+    calls = []
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                calls.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
+                # A crash mid-append can leave a partial line; skip it rather than fail startup
+                print(f"Skipping unreadable scheduled call on line {line_number} of {path}: {str(e)}")
+    return calls
+
+def append_scheduled_call(call: Dict, path: str = SCHEDULED_CALLS_PATH):
+    """Append a single scheduled call without rewriting the file"""
+    with open(path, "a+b") as f:
+        # A crash mid-append can leave a partial last line; terminate it so the new
+        # call starts on its own line instead of being glued onto the broken one
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write(orjson.dumps(call) + b"\n")
+
+def deduplicate_splits(splits: List) -> List:
+    """Drop chunks whose text repeats an earlier chunk, such as shared headers and footers"""
+    seen = set()
+    unique = []
+    for split in splits:
+        digest = xxhash.xxh3_128_intdigest(split.page_content.encode())
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(split)
+    return unique
+
+def load_pdf(path: Path) -> List:
+    """Parse a single PDF; module level so it can run in a worker process"""
+    return UnstructuredPDFLoader(str(path)).load()
+
+@functools.lru_cache(maxsize=256)
+def _is_valid_phone(phone: str) -> bool:
+    """Validate a phone number, rejecting obvious typos before the full parse"""
+    if sum(c.isalnum() for c in phone) < _PHONE_MIN_ALNUM:
+        return False
+    try:
+        parsed = phonenumbers.parse(phone, "US")
+        return phonenumbers.is_valid_number(parsed)
+    except:
+        return False
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date_cached(lower_query: str, today_iso: str) -> Optional[str]:
+    """Resolve a lowercased date phrase relative to today_iso into YYYY-MM-DD"""
+    try:
+        # Today's date in the local timezone, as computed by the caller
+        now = datetime.fromisoformat(today_iso)
+        
+        # Handle relative dates with a single dispatch over the cheapest phrases
+        for phrase, delta in _RELATIVE_DATES.items():
+            if phrase in lower_query:
+                return (now + delta).strftime("%Y-%m-%d")
+        
+        # Handle specific days of the week ("friday" and "next friday" both mean the next occurrence)
+        # Plurals ("mondays") count too; no weekday name itself ends in "s"
+        weekdays = _WEEKDAYS.keys() & {word.removesuffix("s") for word in _WORD_RE.findall(lower_query)}
+        if weekdays:
+            # Several days mentioned: take the earliest in the week, as before
+            day = next(day for day in _WEEKDAYS if day in weekdays)
+            next_occurrence = now + relativedelta(weekday=_WEEKDAYS[day](+1))
+            return next_occurrence.strftime("%Y-%m-%d")
+            
+        # Handle "next month"
+        if "next month" in lower_query:
+            next_month = now + relativedelta(months=1)
+            return next_month.strftime("%Y-%m-%d")
+        
+        # Handle specific date formats
+        try:
+            # Try parsing various date formats
+            parsed_date = parser.parse(lower_query, default=now, dayfirst=False, fuzzy=True)
+            # If the year is not specified, assume current year
+            if parsed_date.year == 1900:
+                parsed_date = parsed_date.replace(year=now.year)
+            # If the parsed date is in the past, assume next occurrence
+            if parsed_date.date() < now.date():
+                if parsed_date.month < now.month:
+                    parsed_date = parsed_date.replace(year=now.year + 1)
+            return parsed_date.strftime("%Y-%m-%d")
+            
+        except:
+            # Handle MM/DD/YYYY format
+            if '/' in lower_query:
+                parts = lower_query.split('/')
+                if len(parts) == 3:
+                    month, day, year = map(int, parts)
+                    parsed_date = datetime(year, month, day)
+                    return parsed_date.strftime("%Y-%m-%d")
+                elif len(parts) == 2:
+                    # If year is omitted, assume current year
+                    month, day = map(int, parts)
+                    parsed_date = datetime(now.year, month, day)
+                    if parsed_date.date() < now.date():
+                        parsed_date = parsed_date.replace(year=now.year + 1)
+                    return parsed_date.strftime("%Y-%m-%d")
+        
+        return None
+        
+    except Exception as e:
+        print(f"Date parsing error: {str(e)}")
+        return None
+
+class _AsyncTokenQueueHandler(AsyncCallbackHandler):
+    """Forward streamed LLM tokens into an asyncio queue read by ChatBot.astream"""
+    
+    def __init__(self, tokens: asyncio.Queue):
+        self.tokens = tokens
+    
+    async def on_llm_new_token(self, token: str, **kwargs):
+        await self.tokens.put(token)
+
+async def run_in_daemon_thread(func, *args):
+    """Like asyncio.to_thread, but on a daemon thread so a blocked input() never delays exit"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(set_outcome, value):
+        # The awaiting task may have been cancelled (e.g. by Ctrl+C) in the meantime
+        if not future.done():
+            set_outcome(value)
+    
+    def run():
+        try:
+            outcome = (future.set_result, func(*args))
+        except Exception as e:
+            outcome = (future.set_exception, e)
+        try:
+            loop.call_soon_threadsafe(resolve, *outcome)
+        except RuntimeError:
+            # The event loop has already closed, so nothing is waiting for the result
+            pass
+    
+    threading.Thread(target=run, daemon=True).start()
+    return await future
+
 class ChatBot:
     def __init__(self):
         self.setup_document_qa()
         self.setup_tools()
         self.user_info = {}
-        self.scheduled_calls = []  # List to store scheduled calls
+        self.scheduled_calls = load_scheduled_calls()  # Calls persisted across restarts
         
     def setup_document_qa(self):
         try:
-            # Load and process documents
-            loader = DirectoryLoader(
-                "./documents", 
-                glob="**/*.pdf",
-                loader_cls=UnstructuredPDFLoader
+            # Locate the vectorstore for the current documents
+            persist_directory = os.path.join(
+                CHROMA_DIR,
+                EMBEDDINGS_BACKEND,
+                COLLECTION_METADATA["hnsw:space"],
+                INDEX_VERSION,
+                documents_fingerprint()
             )
-            documents = loader.load()
             
-            # Split documents into chunks
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200
-            )
-            splits = text_splitter.split_documents(documents)
+            # Chroma creates the directory before anything is embedded, so only a
+            # marker written after a successful ingest means the index is complete
+            index_marker = os.path.join(persist_directory, INDEX_COMPLETE_MARKER)
+            
+            splits = None
+            if not os.path.exists(index_marker):
+                # Discard any partial index left behind by an interrupted or failed ingest
+                shutil.rmtree(persist_directory, ignore_errors=True)
+                
+                # Load and process documents, parsing PDFs in parallel across cores.
+                # This runs before the embedding model is loaded so the workers are not
+                # forked from a process with torch, ONNX Runtime or CUDA threads running.
+                paths = sorted(Path(DOCUMENTS_DIR).rglob("*.pdf"))
+                max_workers = max(1, min(len(paths), os.cpu_count() or 1))
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    documents = [doc for docs in executor.map(load_pdf, paths) for doc in docs]
+                
+                # Split documents into chunks
+                text_splitter = RecursiveCharacterTextSplitter(
+                    chunk_size=1000,
+                    chunk_overlap=200
+                )
+                splits = deduplicate_splits(text_splitter.split_documents(documents))
             
             # Setup embeddings and vectorstore
-            embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-mpnet-base-v2",
-                model_kwargs={'device': 'cpu'}
-            )
-            self.vectorstore = Chroma.from_documents(splits, embeddings)
+            embeddings = get_embeddings(EMBEDDINGS_BACKEND)
             
-            # Initialize LLM with correct model name
-            llm = ChatGroq(
-                temperature=0.7,
-                model_name="llama-3.2-3b-preview",
-                max_tokens=4096
-            )
+            if splits is None:
+                # Reuse the index built for this exact set of documents
+                self.vectorstore = Chroma(
+                    persist_directory=persist_directory,
+                    embedding_function=embeddings,
+                    collection_metadata=COLLECTION_METADATA
+                )
+            else:
+                # Embed and persist the vectorstore (chromadb>=0.4 writes to disk automatically)
+                self.vectorstore = Chroma.from_documents(
+                    splits,
+                    embeddings,
+                    persist_directory=persist_directory,
+                    collection_metadata=COLLECTION_METADATA
+                )
+                Path(index_marker).touch()
+                prune_stale_indexes(persist_directory)
+            
+            # Use the shared LLM client; the answer is streamed token by token
+            llm = get_llm()
+            
+            # Rephrasing the follow-up question is internal, so it is not streamed to the user
+            condense_question_llm = get_llm(streaming=False)
             
             # Setup memory with updated parameters if any
             self.memory = ConversationBufferMemory(
@@ -70,7 +346,11 @@ class ChatBot:
             # Setup QA chain with verbose=False
             self.qa_chain = ConversationalRetrievalChain.from_llm(
                 llm=llm,
-                retriever=self.vectorstore.as_retriever(),
+                condense_question_llm=condense_question_llm,
+                retriever=self.vectorstore.as_retriever(
+                    search_type="similarity",
+                    search_kwargs={"k": RETRIEVER_K}
+                ),
                 memory=self.memory,
                 verbose=False,
                 return_source_documents=True,
@@ -96,92 +376,15 @@ class ChatBot:
         ]
 
     def validate_email(self, email: str) -> bool:
-        pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-        return bool(re.match(pattern, email))
+        return _EMAIL_RE.match(email) is not None
     
     def validate_phone(self, phone: str) -> bool:
-        try:
-            parsed = phonenumbers.parse(phone, "US")
-            return phonenumbers.is_valid_number(parsed)
-        except:
-            return False
-            
-    def parse_date(self, date_string: str) -> str:
-        try:
-            # Get current date and time in local timezone
-            now = datetime.now(pytz.timezone('Asia/Kathmandu'))
-            
-            # Handle relative dates
-            lower_query = date_string.lower()
-            
-            # Handle "today"
-            if "today" in lower_query:
-                return now.strftime("%Y-%m-%d")
-            
-            # Handle "tomorrow"
-            if "tomorrow" in lower_query:
-                tomorrow = now + timedelta(days=1)
-                return tomorrow.strftime("%Y-%m-%d")
-            
-            # Handle "next week"
-            if "next week" in lower_query:
-                next_week = now + timedelta(days=7)
-                return next_week.strftime("%Y-%m-%d")
-            
-            # Handle specific days of the week
-            weekday_mapping = {
-                'monday': MO, 'tuesday': TU, 'wednesday': WE,
-                'thursday': TH, 'friday': FR, 'saturday': SA, 'sunday': SU
-            }
+        return _is_valid_phone(phone)
             
-            for day, day_const in weekday_mapping.items():
-                if f"next {day}" in lower_query:
-                    next_day = now + relativedelta(weekday=day_const(+1))
-                    return next_day.strftime("%Y-%m-%d")
-                elif day in lower_query:
-                    # If just the day is mentioned, get the next occurrence
-                    next_occurrence = now + relativedelta(weekday=day_const(+1))
-                    return next_occurrence.strftime("%Y-%m-%d")
-                
-            # Handle "next month"
-            if "next month" in lower_query:
-                next_month = now + relativedelta(months=1)
-                return next_month.strftime("%Y-%m-%d")
-            
-            # Handle specific date formats
-            try:
-                # Try parsing various date formats
-                parsed_date = parser.parse(date_string, dayfirst=False, fuzzy=True)
-                # If the year is not specified, assume current year
-                if parsed_date.year == 1900:
-                    parsed_date = parsed_date.replace(year=now.year)
-                # If the parsed date is in the past, assume next occurrence
-                if parsed_date.date() < now.date():
-                    if parsed_date.month < now.month:
-                        parsed_date = parsed_date.replace(year=now.year + 1)
-                return parsed_date.strftime("%Y-%m-%d")
-                
-            except:
-                # Handle MM/DD/YYYY format
-                if '/' in date_string:
-                    parts = date_string.split('/')
-                    if len(parts) == 3:
-                        month, day, year = map(int, parts)
-                        parsed_date = datetime(year, month, day)
-                        return parsed_date.strftime("%Y-%m-%d")
-                    elif len(parts) == 2:
-                        # If year is omitted, assume current year
-                        month, day = map(int, parts)
-                        parsed_date = datetime(now.year, month, day)
-                        if parsed_date.date() < now.date():
-                            parsed_date = parsed_date.replace(year=now.year + 1)
-                        return parsed_date.strftime("%Y-%m-%d")
-            
-            return None
-            
-        except Exception as e:
-            print(f"Date parsing error: {str(e)}")
-            return None
+    def parse_date(self, date_string: str) -> Optional[str]:
+        # Results only depend on the phrase and today's date, so cache on both
+        today_iso = datetime.now(_TZ).date().isoformat()
+        return _parse_date_cached(date_string.lower(), today_iso)
     
     def collect_user_info(self):
         user_info = {}
@@ -223,13 +426,15 @@ class ChatBot:
                 response += f"Email: {self.user_info['email']}\n"
                 response += f"Phone: {self.user_info['phone']}\n"
                 
-                # Store the scheduled call
-                self.scheduled_calls.append({
+                # Store the scheduled call in memory and on disk
+                call = {
                     'date': date_str,
                     'name': self.user_info['name'],
                     'email': self.user_info['email'],
                     'phone': self.user_info['phone']
-                })
+                }
+                self.scheduled_calls.append(call)
+                append_scheduled_call(call)
                 
                 return response
             else:
@@ -243,10 +448,10 @@ class ChatBot:
         if not self.scheduled_calls:
             return "No scheduled calls at the moment."
         
-        response = "Here are your scheduled calls:\n"
-        for call in self.scheduled_calls:
-            response += f"- Date: {call['date']}, Name: {call['name']}, Email: {call['email']}, Phone: {call['phone']}\n"
-        return response
+        return "Here are your scheduled calls:\n" + "".join(
+            f"- Date: {call['date']}, Name: {call['name']}, Email: {call['email']}, Phone: {call['phone']}\n"
+            for call in self.scheduled_calls
+        )
 
     def clear_history(self):
         """Clear the conversation history"""
@@ -257,7 +462,34 @@ class ChatBot:
         except Exception as e:
             return f"Error clearing chat history: {str(e)}"
 
-    def process_query(self, query: str):
+    async def astream(self, query: str) -> AsyncIterator[str]:
+        """Answer a query, yielding the response as it is produced"""
+        # Commands may prompt with input(), so run them off the event loop
+        response = await run_in_daemon_thread(self.handle_command, query)
+        if response is not None:
+            yield response
+            return
+        
+        # Handle document QA queries, streaming the answer as it is generated.
+        # The chain only calls the LLM to rephrase the question when chat_history
+        # is non-empty, so the first turn already makes a single LLM call.
+        tokens = asyncio.Queue()
+        task = asyncio.create_task(self.qa_chain.ainvoke(
+            {"question": query},
+            config={"callbacks": [_AsyncTokenQueueHandler(tokens)]}
+        ))
+        task.add_done_callback(lambda _: tokens.put_nowait(None))
+        while (token := await tokens.get()) is not None:
+            yield token
+        
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error:
+            yield _QUERY_ERROR_MESSAGE.format(error)
+
+    def handle_command(self, query: str) -> Optional[str]:
+        """Answer commands and scheduling requests; None means the query is for document QA"""
         # Add clear history command
         if query.lower().strip() in ['clear history', 'clear chat', 'erase history', 'erase chat']:
             return self.clear_history()
@@ -266,47 +498,21 @@ class ChatBot:
         if "show scheduled calls" in query.lower():
             return self.show_scheduled_calls()
             
-        # Enhanced scheduling keywords
-        scheduling_keywords = [
-            'schedule', 'book', 'appointment', 'call', 'meet',
-            'want to talk', 'discuss', 'consultation', 'meeting',
-            'set up', 'arrange', 'plan', 'catch up', 'sync',
-            'connect', 'get in touch', 'reach out'
-        ]
-        
-        # Time-related keywords
-        time_keywords = [
-            'morning', 'afternoon', 'evening', 'night',
-            'today', 'tomorrow', 'next', 'weekend',
-            'monday', 'tuesday', 'wednesday', 'thursday', 'friday',
-            'saturday', 'sunday', 'week', 'month',
-            'am', 'pm', 'o\'clock', ':00'
-        ]
-        
-        # Help keywords
-        help_keywords = [
-            'help', 'how to', 'guide', 'explain',
-            'what can you do', 'capabilities', 'features'
-        ]
-        
         try:
             lower_query = query.lower()
             
             # Handle help requests
-            if any(keyword in lower_query for keyword in help_keywords):
+            if _HELP_RE.search(lower_query):
                 return self.show_help()
             
             # Handle memory-related queries
-            if any(phrase in lower_query for phrase in [
-                'what did i just', 'last question', 'previous',
-                'what were we talking about', 'what was i saying'
-            ]):
+            if _MEMORY_RE.search(lower_query):
                 return self.get_conversation_history()
             
             # Handle scheduling context
             if self.user_info:
                 # User has already provided contact info
-                if any(word in lower_query for word in time_keywords):
+                if _TIME_RE.search(lower_query):
                     return self.handle_scheduling(query)
                 elif 'cancel' in lower_query or 'reschedule' in lower_query:
                     return self.handle_cancellation()
@@ -314,20 +520,17 @@ class ChatBot:
                     return self.update_user_info(query)
             
             # Handle new scheduling requests
-            if any(keyword in lower_query for keyword in scheduling_keywords):
+            if _SCHEDULING_RE.search(lower_query):
                 return self.handle_scheduling(query)
             
             # Handle basic commands
             if lower_query.strip() in ['call', 'schedule', 'book']:
                 return self.show_scheduling_help()
             
-            # Handle document QA queries
-            result = self.qa_chain.invoke({"question": query, "chat_history": self.memory.chat_memory.messages})
-            return result["answer"]
+            return None
             
         except Exception as e:
-            error_msg = f"I encountered an error processing your query. Please try again. Error: {str(e)}"
-            return error_msg
+            return _QUERY_ERROR_MESSAGE.format(e)
 
     def show_help(self):
         """Show available commands and features"""
@@ -420,13 +623,11 @@ Please let me know how you'd like to proceed!
                 return "This is the start of our conversation."
                 
             last_exchanges = chat_history[-4:]  # Get last 2 exchanges
-            summary = "Recent conversation:\n\n"
+            parts = ["Recent conversation:\n\n"]
             for msg in last_exchanges:
-                if "Human" in str(msg):
-                    summary += f"You: {str(msg).split('Human: ')[1]}\n"
-                else:
-                    summary += f"Bot: {str(msg).split('Assistant: ')[1]}\n"
-            return summary
+                role = "You" if msg.type == "human" else "Bot"
+                parts.append(f"{role}: {msg.content}\n")
+            return "".join(parts)
             
         except Exception as e:
             return f"Error retrieving conversation history: {str(e)}"
\ No newline at end of file
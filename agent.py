@@ -2,19 +2,17 @@ import re
 from typing import List, Union, Tuple
 from langchain.agents import Tool, AgentExecutor, LLMSingleActionAgent
 from langchain.schema import AgentAction, AgentFinish
-from langchain_groq import ChatGroq
+from llm_client import get_llm
+
+_ACTION_RE = re.compile(r"Action: (.*?)[\n]*Action Input: (.*)", re.DOTALL)
+_SCHEDULING_RE = re.compile(r"schedule|appointment|book|call me|contact")
 
 class CustomAgent:
     def __init__(self):
-        self.llm = ChatGroq(
-            temperature=0.7,
-            model_name="llama-3.2-3b-preview",
-            max_tokens=4096
-        )
+        self.llm = get_llm()
     
     def should_use_tool(self, query: str) -> bool:
-        scheduling_keywords = ['schedule', 'appointment', 'book', 'call me', 'contact']
-        return any(keyword in query.lower() for keyword in scheduling_keywords)
+        return _SCHEDULING_RE.search(query.lower()) is not None
 
     def parse_output(self, llm_output: str) -> Union[AgentAction, AgentFinish]:
         if "Final Answer:" in llm_output:
@@ -23,7 +21,7 @@ class CustomAgent:
                 log=llm_output,
             )
             
-        action_match = re.search(r"Action: (.*?)[\n]*Action Input: (.*)", llm_output, re.DOTALL)
+        action_match = _ACTION_RE.search(llm_output)
         if not action_match:
             return AgentFinish(
                 return_values={"output": llm_output},
@@ -0,0 +1,135 @@
+import os
+import shutil
+from typing import Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+from model2vec import StaticModel
+
+# torch and sentence_transformers are imported inside the MPNet backends only, so the
+# default model2vec backend (and every ingest worker process) skips their import cost
+MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+
+# Static model2vec distillation of MPNet is cached here
+STATIC_MODEL_DIR = "./models/m2v_mpnet"
+STATIC_PCA_DIMS = 256
+
+# Exported ONNX model and its INT8 quantized variant are cached here
+ONNX_CACHE_DIR = "./models/all-mpnet-base-v2-onnx"
+QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Large batches amortize tokenization and matmul overhead across chunks
+DEFAULT_ENCODE_KWARGS = {"batch_size": 64, "normalize_embeddings": True}
+GPU_ENCODE_KWARGS = {"batch_size": 128}
+
+
+class OnnxEmbeddings(Embeddings):
+    """MPNet sentence embeddings served by ONNX Runtime with dynamic INT8 quantization"""
+
+    def __init__(
+        self,
+        model_name: str = MODEL_NAME,
+        cache_dir: str = ONNX_CACHE_DIR,
+        encode_kwargs: Optional[Dict] = None
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        self.encode_kwargs = {**DEFAULT_ENCODE_KWARGS, **(encode_kwargs or {})}
+        if not os.path.exists(os.path.join(cache_dir, QUANTIZED_FILE)):
+            self.export_quantized_model(model_name, cache_dir)
+
+        self.model = SentenceTransformer(
+            cache_dir,
+            backend="onnx",
+            model_kwargs={"file_name": QUANTIZED_FILE}
+        )
+
+    @staticmethod
+    def export_quantized_model(model_name: str, cache_dir: str):
+        """Export the model to ONNX and quantize it once, caching both to disk"""
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save_pretrained(cache_dir)
+        export_dynamic_quantized_onnx_model(model, "avx512_vnni", cache_dir)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # encode() sorts texts by length internally, so each batch is padded minimally
+        return self.model.encode(texts, convert_to_numpy=True, **self.encode_kwargs).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(text, convert_to_numpy=True, **self.encode_kwargs).tolist()
+
+
+class TorchEmbeddings(Embeddings):
+    """MPNet sentence embeddings in PyTorch with the transformer compiled by torch.compile"""
+
+    def __init__(self, model_name: str = MODEL_NAME, encode_kwargs: Optional[Dict] = None):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        # Run in FP16 with larger batches on a GPU when one is present
+        if torch.cuda.is_available():
+            device, dtype = "cuda", torch.float16
+            defaults = {**DEFAULT_ENCODE_KWARGS, **GPU_ENCODE_KWARGS}
+        else:
+            device, dtype = "cpu", torch.float32
+            defaults = DEFAULT_ENCODE_KWARGS
+
+        self.encode_kwargs = {**defaults, **(encode_kwargs or {})}
+        self.model = SentenceTransformer(
+            model_name,
+            device=device,
+            model_kwargs={"torch_dtype": dtype}
+        )
+
+        # Compile lazily on the first forward pass; dynamic shapes avoid recompiling per sequence length
+        transformer = self.model[0]
+        transformer.auto_model = torch.compile(transformer.auto_model, dynamic=True)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, convert_to_numpy=True, **self.encode_kwargs).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(text, convert_to_numpy=True, **self.encode_kwargs).tolist()
+
+
+class StaticEmbeddings(Embeddings):
+    """model2vec static embeddings distilled from MPNet: averaged token vectors, no transformer layers"""
+
+    def __init__(self, model_name: str = MODEL_NAME, model_dir: str = STATIC_MODEL_DIR):
+        if not os.path.isdir(model_dir):
+            self.distill_model(model_name, model_dir)
+
+        self.model = StaticModel.from_pretrained(model_dir)
+
+    @staticmethod
+    def distill_model(model_name: str, model_dir: str):
+        """Distill the transformer into a static model once, caching it to disk"""
+        from model2vec.distill import distill
+
+        model = distill(model_name=model_name, pca_dims=STATIC_PCA_DIMS)
+
+        # Save beside the target and move it into place, so model_dir only ever exists complete
+        tmp_dir = f"{model_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        model.save_pretrained(tmp_dir)
+        os.replace(tmp_dir, model_dir)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(text).tolist()
+
+
+def get_embeddings(backend: str) -> Embeddings:
+    """Return the embeddings implementation for the given backend name"""
+    if backend == "model2vec":
+        return StaticEmbeddings()
+    if backend == "mpnet":
+        import torch
+
+        # The INT8 ONNX model targets CPU kernels; on a GPU the FP16 PyTorch model is faster
+        return TorchEmbeddings() if torch.cuda.is_available() else OnnxEmbeddings()
+    if backend == "mpnet-torch":
+        return TorchEmbeddings()
+    raise ValueError(f"Unknown embeddings backend: {backend}")
@@ -0,0 +1,21 @@
+import httpx
+from langchain_groq import ChatGroq
+
+_LLM = None
+
+def get_llm(streaming: bool = True) -> ChatGroq:
+    """Return the process-wide ChatGroq client so every caller reuses one HTTP/2 connection pool"""
+    global _LLM
+    if _LLM is None:
+        _LLM = ChatGroq(
+            temperature=0.7,
+            model_name="llama-3.2-3b-preview",
+            max_tokens=4096,
+            streaming=True,
+            http_client=httpx.Client(http2=True),
+            http_async_client=httpx.AsyncClient(http2=True)
+        )
+    if streaming:
+        return _LLM
+    # A shallow copy keeps the same underlying Groq client and its connections
+    return _LLM.model_copy(update={"streaming": False})
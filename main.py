@@ -1,16 +1,31 @@
-from Agentic_RAG import ChatBot
+import os
+import sys
+import asyncio
+from Agentic_RAG import ChatBot, run_in_daemon_thread
 
-def main():
+async def main():
     chatbot = ChatBot()
     
     print("Chatbot initialized. Type 'quit' to exit.")
     while True:
-        query = input("You: ")
+        # Wait for input on a daemon thread so the event loop stays free and Ctrl+C exits at once
+        query = await run_in_daemon_thread(input, "You: ")
         if query.lower() == 'quit':
             break
             
-        response = chatbot.process_query(query)
-        print(f"Bot: {response}")
+        # Print the response as it is produced; document answers arrive token by token.
+        # The prefix waits for the first token so prompts for contact details stay readable.
+        prefix = "Bot: "
+        async for token in chatbot.astream(query):
+            print(prefix + token, end="", flush=True)
+            prefix = ""
+        print()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # A daemon thread may still hold stdin inside input(); exit without finalizing it
+        print()
+        sys.stdout.flush()
+        os._exit(130)
\ No newline at end of file